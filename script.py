@@ -1,6 +1,272 @@
+import csv
+import functools
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 
+# pyarrow is optional: when installed it is used for faster CSV parsing.
+try:
+   import pyarrow as pa
+   import pyarrow.csv as pa_csv
+except ImportError:
+   pa = None
+
+# All input columns are treated as text. With pyarrow they are loaded as pyarrow strings,
+# so .str, isin and notna run as native kernels; without it they are Python objects.
+TEXT_DTYPE = "string[pyarrow]" if pa is not None else object
+
+# Cell values read as missing, the same tokens `pd.read_csv` treats as missing by default.
+MISSING_VALUES = [
+   '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+   '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+# python-calamine is optional: when installed it is used for faster Excel parsing.
+try:
+   import python_calamine
+except ImportError:
+   python_calamine = None
+
+# Chunk size used when streaming CSV files: rows per chunk for pandas,
+# bytes per block for pyarrow (which splits its input by size).
+CHUNK_ROWS = 200_000
+CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def read_csv_file(file_path):
+   """
+   Load a CSV file with every column read as text and return a DataFrame.
+
+
+   Arguments:
+   - file_path: The path to the CSV file to be loaded.
+
+
+   Returns:
+   - A pandas DataFrame containing the file's data as strings (empty cells are missing values).
+
+
+   Steps:
+   1. If pyarrow is not installed:
+      - Use `pd.read_csv` with `dtype=object` to load the file.
+   2. Otherwise:
+      - Read the header row to get the column names (made unique like pandas does).
+      - Parse the file with pyarrow, typing every column as a string so values such as
+        ZIP codes keep their leading zeros.
+      - Convert the result to a DataFrame backed by pyarrow strings.
+      - If pyarrow cannot parse the file (e.g. a row has fewer fields than the header),
+        load it with `pd.read_csv` instead and convert the columns to pyarrow strings.
+   """
+   if pa is None:
+       # Load the CSV file into a DataFrame.
+       return pd.read_csv(file_path, dtype=object)
+
+
+   # Parse the CSV file natively and keep the columns as pyarrow-backed strings.
+   try:
+       table = pa_csv.read_csv(file_path, **text_csv_options(file_path))
+   except pa.ArrowInvalid:
+       # pyarrow rejects rows with fewer fields than the header; pandas fills them with missing values.
+       return pd.read_csv(file_path, dtype=object).astype(TEXT_DTYPE)
+   return arrow_to_pandas(table)
+
+
+def read_csv_header(file_path):
+   """
+   Read the column names from the header row of a CSV file.
+
+
+   Arguments:
+   - file_path: The path to the CSV file.
+
+
+   Returns:
+   - A list of column names, made unique the way `pd.read_csv` does it: blank names become
+     'Unnamed: N' (N being the column position) and repeated names get '.1', '.2', ... suffixes.
+   """
+   with open(file_path, newline='', encoding='utf-8-sig') as csv_file:
+       header = next(csv.reader(csv_file), [])
+
+
+   header = [name if name != '' else f"Unnamed: {position}" for position, name in enumerate(header)]
+   header_names = set(header)
+
+
+   column_names = []
+   name_counts = {}
+   for name in header:
+       # Add a numbered suffix to repeated names, skipping suffixes already used elsewhere in the header.
+       count = name_counts.get(name, 0)
+       base_name = name
+       while count > 0:
+           name_counts[base_name] = count + 1
+           name = f"{base_name}.{count}"
+           count = count + 1 if name in header_names else name_counts.get(name, 0)
+       name_counts[name] = count + 1
+       column_names.append(name)
+
+
+   return column_names
+
+
+def text_csv_options(file_path, block_size=None):
+   """
+   Build the pyarrow options that read every column of a CSV file as a string.
+
+
+   Arguments:
+   - file_path: The path to the CSV file.
+   - block_size: Optional number of bytes pyarrow parses at a time (used when streaming).
+
+
+   Returns:
+   - A dict of `read_options`, `parse_options` and `convert_options` for `pyarrow.csv.read_csv`
+     or `pyarrow.csv.open_csv`, where:
+     - The column names come from `read_csv_header` (so they match the names pandas would use).
+     - Quoted values may contain line breaks (e.g. multi-line street addresses).
+     - Each column is typed as a string, with empty cells and the other `MISSING_VALUES`
+       tokens read as missing values (as with `pd.read_csv`).
+   """
+   # Read the column names so every column can be typed as a string (no type inference).
+   column_names = read_csv_header(file_path)
+
+
+   read_options = pa_csv.ReadOptions(column_names=column_names, skip_rows=1)
+   if block_size is not None:
+       read_options.block_size = block_size
+
+
+   return {
+       'read_options': read_options,
+       'parse_options': pa_csv.ParseOptions(newlines_in_values=True),
+       'convert_options': pa_csv.ConvertOptions(
+           column_types={name: pa.string() for name in column_names},
+           null_values=MISSING_VALUES,
+           strings_can_be_null=True
+       )
+   }
+
+
+def arrow_to_pandas(data):
+   """
+   Convert a pyarrow Table or RecordBatch to a DataFrame backed by pyarrow strings.
+   """
+   return data.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+
+
+def iter_file_chunks(file_path):
+   """
+   Load a CSV or Excel file in chunks and yield each chunk as a DataFrame.
+
+
+   Arguments:
+   - file_path: The path to the file (CSV or Excel) to be loaded.
+
+
+   Yields:
+   - pandas DataFrames with the same columns, in file order (at least one, even for an empty file).
+
+
+   Steps:
+   1. If the file is a CSV:
+      - Without pyarrow, use `pd.read_csv` with `chunksize=CHUNK_ROWS`.
+      - With pyarrow, stream the file in blocks of `CHUNK_BYTES`, reading every column as text.
+        If pyarrow cannot parse a block (e.g. a row has fewer fields than the header), continue
+        with `pd.read_csv` from the first row pyarrow did not yield.
+   2. If the file is an Excel file (.xls or .xlsx), which cannot be streamed:
+      - Yield the whole file as a single chunk, with date columns formatted by `format_excel_dates`.
+   3. If the file type is unsupported:
+      - Raise a ValueError to alert the user.
+   """
+   file_extension = os.path.splitext(file_path)[-1].lower()  # Extract the file extension.
+
+
+   if file_extension in [".xls", ".xlsx"]:
+       yield format_excel_dates(read_excel_file(file_path)).astype(TEXT_DTYPE)
+   elif file_extension != ".csv":
+       # Raise an error if the file type is unsupported.
+       raise ValueError("Unsupported file type. Please provide a CSV or Excel file.")
+   elif pa is None:
+       yield from pd.read_csv(file_path, dtype=object, chunksize=CHUNK_ROWS)
+   else:
+       rows_yielded = 0
+       try:
+           reader = pa_csv.open_csv(file_path, **text_csv_options(file_path, block_size=CHUNK_BYTES))
+           has_rows = False
+           for batch in reader:
+               has_rows = True
+               rows_yielded += batch.num_rows
+               yield arrow_to_pandas(batch)
+
+
+           # A file with only a header row still yields its (empty) columns.
+           if not has_rows:
+               yield arrow_to_pandas(reader.schema.empty_table())
+       except pa.ArrowInvalid:
+           # pyarrow rejects rows with fewer fields than the header; pandas fills them with missing values.
+           # Re-read the file with pandas, skipping the rows that were already yielded.
+           rows_to_skip = rows_yielded
+           for chunk in pd.read_csv(file_path, dtype=object, chunksize=CHUNK_ROWS):
+               if rows_to_skip >= len(chunk):
+                   rows_to_skip -= len(chunk)
+                   continue
+               yield chunk.iloc[rows_to_skip:].astype(TEXT_DTYPE)
+               rows_to_skip = 0
+
+
+def read_excel_file(file_path):
+   """
+   Load an Excel file (.xls or .xlsx) and return a DataFrame of the raw cell values.
+
+
+   Arguments:
+   - file_path: The path to the Excel file to be loaded.
+
+
+   Returns:
+   - A pandas DataFrame with object columns holding the cells as read (text, numbers, dates).
+   """
+   file_extension = os.path.splitext(file_path)[-1].lower()  # Extract the file extension.
+
+
+   # Use appropriate engines for different Excel formats.
+   # The Rust-based calamine engine reads both formats and is much faster than xlrd/openpyxl.
+   if python_calamine is not None:
+       engine = 'calamine'
+   else:
+       engine = 'xlrd' if file_extension == '.xls' else 'openpyxl'
+
+
+   # Load the Excel file into a DataFrame.
+   return pd.read_excel(file_path, dtype=object, engine=engine)
+
+
+def format_excel_dates(df):
+   """
+   Write the date columns of an Excel main file as text, the way pandas writes datetime columns to CSV.
+
+
+   Arguments:
+   - df: DataFrame of raw Excel cell values (from `read_excel_file`); it is modified in place.
+
+
+   Returns:
+   - The same DataFrame. Columns holding only dates become text: 'YYYY-MM-DD' when every value is
+     midnight, 'YYYY-MM-DD HH:MM:SS' otherwise. Columns mixing dates with other values are left as-is.
+   """
+   for column_number in range(df.shape[1]):
+       values = df.iloc[:, column_number]
+       if pd.api.types.infer_dtype(values, skipna=True) == 'datetime':
+           dates = pd.to_datetime(values)
+           present_dates = dates.dropna()
+           date_format = '%Y-%m-%d' if (present_dates == present_dates.dt.normalize()).all() else '%Y-%m-%d %H:%M:%S'
+           df.isetitem(column_number, dates.dt.strftime(date_format))
+
+
+   return df
+
 
 def load_file(file_path):
    """
@@ -18,9 +284,10 @@ def load_file(file_path):
    Steps:
    1. Extract the file extension from the provided file path.
    2. If the file is a CSV:
-      - Use `pd.read_csv` to load the file.
+      - Use `read_csv_file` to load the file.
    3. If the file is an Excel file (.xls or .xlsx):
-      - Use `pd.read_excel` to load the file.
+      - Use `read_excel_file` to load the file (with the calamine engine if python-calamine is installed),
+        then convert every column to text (pyarrow strings when pyarrow is installed).
    4. If the file type is unsupported:
       - Raise a ValueError to alert the user.
    """
@@ -29,79 +296,156 @@ def load_file(file_path):
 
    if file_extension == ".csv":
        # Load the CSV file into a DataFrame.
-       return pd.read_csv(file_path, dtype=object)
+       return read_csv_file(file_path)
    elif file_extension in [".xls", ".xlsx"]:
-       # Use appropriate engines for different Excel formats.
-       engine = 'xlrd' if file_extension == '.xls' else 'openpyxl'
-
-
-       # Load the Excel file into a DataFrame.
-       return pd.read_excel(file_path, dtype=object, engine=engine)
+       # Load the Excel file into a DataFrame, with every column as text.
+       return read_excel_file(file_path).astype(TEXT_DTYPE)
    else:
        # Raise an error if the file type is unsupported.
        raise ValueError("Unsupported file type. Please provide a CSV or Excel file.")
 
 
+@functools.lru_cache(maxsize=None)
+def normalize_columns(columns):
+   """
+   Standardize column names by stripping surrounding whitespace and lowercasing them.
+
+
+   Arguments:
+   - columns: A tuple of the original column names.
+
+
+   Returns:
+   - A pandas Index of the normalized names. Results are cached, since every chunk of a file
+     (and usually every file in a batch) shares the same header.
+   """
+   return pd.Index(columns).str.strip().str.lower()
+
+
+def split_email_rows(main_df, email_col, email2_col):
+   """
+   Give every email address in the main data its own row.
+
+
+   Arguments:
+   - main_df: DataFrame with lowercase column names.
+   - email_col: Name of the 'Email' column.
+   - email2_col: Name of the 'Email2' column, or None if there is none.
+
+
+   Returns:
+   - A new DataFrame (without the 'Email2' column) where:
+     - Rows with both emails appear twice, the second copy with the two emails swapped.
+     - Rows with only 'Email' are kept as-is.
+     - Rows with only 'Email2' have it moved into 'Email'.
+     - Rows with neither are dropped.
+   """
+   # Flag which rows have a value in each email column (as numpy arrays, so the row
+   # dispatch below is plain array arithmetic with no per-row branching)
+   has_email = main_df[email_col].notna().to_numpy()
+   has_email2 = main_df[email2_col].notna().to_numpy() if email2_col else np.zeros(len(main_df), dtype=bool)
+  
+   # Number of output rows for each input row:
+   # Case 1: Both 'Email' and 'Email2' have values -> the original row plus a swapped copy
+   # Case 2: Only 'Email' has a value -> the original row
+   # Case 3: Only 'Email2' has a value -> the row with 'Email2' moved into 'Email'
+   copies = has_email.astype(np.intp) + has_email2
+  
+   # Gather all output rows with a single positional slice (keeps the original row order)
+   positions = np.repeat(np.arange(len(main_df)), copies)
+   intermediate_df = main_df.iloc[positions].reset_index(drop=True)
+  
+   if email2_col:
+       # The second copy of a Case 1 row is the swapped one
+       is_swapped_copy = np.zeros(len(positions), dtype=bool)
+       is_swapped_copy[1:] = positions[1:] == positions[:-1]
+  
+       # Swapped copies and Case 3 rows take their 'Email' value from 'Email2'
+       # ('Email2' is dropped below, so only the 'Email' column needs to be rewritten)
+       use_email2 = is_swapped_copy | ~has_email[positions]
+       intermediate_df[email_col] = intermediate_df[email_col].mask(use_email2, intermediate_df[email2_col])
+  
+       # Drop the 'Email2' column
+       intermediate_df = intermediate_df.drop(columns=[email2_col])
+
+
+   return intermediate_df
+
+
 def create_intermediate_csv(main_file_path, output_file_path):
-   # Load the main file
-   main_df = load_file(main_file_path)
+   """
+   Split the email addresses of the main file into their own rows and save the intermediate output.
+
+
+   Arguments:
+   - main_file_path: The path to the main file (CSV or Excel).
+   - output_file_path: The path of the intermediate CSV file to create.
+
+
+   Returns:
+   - The intermediate DataFrame.
+
+
+   Steps:
+   1. Stream the main file in chunks with `iter_file_chunks` (Excel files are read whole).
+   2. Process each chunk with `split_email_rows` and append it to the output file.
+   3. Concatenate the processed chunks into the returned DataFrame.
+
+
+   Only the raw input is streamed: the processed chunks are all kept for the returned DataFrame,
+   and while they are concatenated both the chunks and the combined copy are in memory.
+   """
+   intermediate_chunks = []
+   pending_writes = []
   
-   # Standardize column names to lowercase for easier processing
-   main_df.columns = main_df.columns.str.strip().str.lower()
+   # Stream the main file in chunks so the whole raw file is never held in memory,
+   # appending each processed chunk to the intermediate output in the background while the next chunk is read
+   # (a single writer thread keeps the appends in order)
+   with ThreadPoolExecutor(max_workers=1) as csv_writer:
+       for chunk_number, main_df in enumerate(iter_file_chunks(main_file_path)):
+           # Standardize column names to lowercase for easier processing
+           main_df.columns = normalize_columns(tuple(main_df.columns))
   
-   # Identify email-related columns
-   email_col = next((col for col in main_df.columns if col.lower() == 'email'), None)
-   email2_col = next((col for col in main_df.columns if col.lower() == 'email2'), None)
+           if chunk_number == 0:
+               # Identify email-related columns (the names are already lowercase)
+               column_names = set(main_df.columns)
+               email_col = 'email' if 'email' in column_names else None
+               email2_col = 'email2' if 'email2' in column_names else None
   
-   if not email_col:
-       raise ValueError("The main file must contain an 'Email' column.")
+               if not email_col:
+                   raise ValueError("The main file must contain an 'Email' column.")
   
-   # Create a list to store the processed rows
-   processed_rows = []
+           # Split out the email addresses and save the processed chunk
+           chunk_df = split_email_rows(main_df, email_col, email2_col)
+           pending_writes.append(csv_writer.submit(
+               chunk_df.to_csv, output_file_path, mode='w' if chunk_number == 0 else 'a', header=chunk_number == 0, index=False
+           ))
+           intermediate_chunks.append(chunk_df)
   
-   for _, row in main_df.iterrows():
-       # Case 1: Both 'Email' and 'Email2' have values
-       if email2_col and pd.notna(row[email_col]) and pd.notna(row[email2_col]):
-           # Append the original row
-           processed_rows.append(row.to_dict())
-          
-           # Create a copy with swapped 'Email' and 'Email2' values
-           row_copy = row.copy()
-           row_copy[email_col], row_copy[email2_col] = row_copy[email2_col], row_copy[email_col]
-           processed_rows.append(row_copy.to_dict())
-      
-       # Case 2: Only 'Email' has a value
-       elif pd.notna(row[email_col]):
-           processed_rows.append(row.to_dict())
-      
-       # Case 3: Only 'Email2' has a value
-       elif email2_col and pd.notna(row[email2_col]):
-           row[email_col] = row[email2_col]
-           row[email2_col] = None
-           processed_rows.append(row.to_dict())
+       intermediate_df = pd.concat(intermediate_chunks, ignore_index=True)
   
-   # Create a new DataFrame from the processed rows
-   intermediate_df = pd.DataFrame(processed_rows)
+       # Wait for the intermediate output to be fully written (and raise any write error)
+       for pending_write in pending_writes:
+           pending_write.result()
   
-   # Drop the 'Email2' column (if it exists)
-   if email2_col:
-       intermediate_df = intermediate_df.drop(columns=[email2_col], errors='ignore')
-
-
-   # Save the intermediate output
-   intermediate_df.to_csv(output_file_path, index=False)
    print(f"Intermediate output saved at: {output_file_path}")
    return intermediate_df
 
 
-def create_final_csv(intermediate_file_path, secondary_file_path, output_file_path, column_mapping=None):
-   # Load the intermediate and secondary files
-   intermediate_df = pd.read_csv(intermediate_file_path, dtype=object)
+def create_final_csv(intermediate, secondary_file_path, output_file_path, column_mapping=None):
+   # Load the intermediate data (either a DataFrame already in memory or the path to the intermediate file)
+   if isinstance(intermediate, pd.DataFrame):
+       intermediate_df = intermediate
+   else:
+       intermediate_df = read_csv_file(intermediate)
+  
+   # Load the secondary file
    secondary_df = load_file(secondary_file_path)
   
    # Standardize column names to lowercase for easier matching
-   intermediate_df.columns = intermediate_df.columns.str.strip().str.lower()
-   secondary_df.columns = secondary_df.columns.str.strip().str.lower()
+   # (set_axis returns a new frame, so a DataFrame passed in by the caller is not modified)
+   intermediate_df = intermediate_df.set_axis(normalize_columns(tuple(intermediate_df.columns)), axis=1)
+   secondary_df.columns = normalize_columns(tuple(secondary_df.columns))
   
    # Apply column mapping to the secondary file if provided
    if column_mapping:
@@ -109,20 +453,26 @@ def create_final_csv(intermediate_file_path, secondary_file_path, output_file_pa
 
 
    # Filter out rows from secondary_df without an email value
-   # Comment out line 103 if you want to append ALL rows that DO NOT have a matching VIN & Email from secondary file
+   # Comment out the line below if you want to append ALL rows that DO NOT have a matching VIN & Email from secondary file
    secondary_df = secondary_df[secondary_df["email"].notna()]
   
-   # Identify unmatched rows in the secondary file
-   unmatched_secondary = secondary_df[~(
-       (secondary_df['vin'].isin(intermediate_df['vin'])) &
-       (secondary_df['email'].isin(intermediate_df['email']))
-   )]
+   # Only the distinct intermediate pairs are needed for the lookup (repeat rows add nothing to it)
+   key_columns = ['vin', 'email']
+   intermediate_pairs = intermediate_df[key_columns].drop_duplicates()
+  
+   # Identify unmatched rows in the secondary file (no intermediate row with the same VIN & Email pair)
+   intermediate_keys = pd.MultiIndex.from_arrays([intermediate_pairs[key] for key in key_columns])
+   secondary_keys = pd.MultiIndex.from_arrays([secondary_df[key] for key in key_columns])
+   unmatched_secondary = secondary_df[~secondary_keys.isin(intermediate_keys)]
   
    # Map data from secondary file to intermediate structure
-   mapped_secondary = unmatched_secondary.reindex(columns=intermediate_df.columns)
+   # Only the shared columns are carried over, so the frames line up exactly before combining
+   final_columns = intermediate_df.columns
+   shared_columns = unmatched_secondary.columns.intersection(final_columns)
+   mapped_secondary = unmatched_secondary.loc[:, shared_columns].reindex(columns=final_columns)
   
    # Combine the intermediate data and the mapped secondary data
-   final_df = pd.concat([intermediate_df, mapped_secondary], ignore_index=True)
+   final_df = pd.concat([intermediate_df, mapped_secondary], ignore_index=True, sort=False)
   
    # Save the final output
    final_df.to_csv(output_file_path, index=False)
@@ -136,6 +486,47 @@ def create_final_csv(intermediate_file_path, secondary_file_path, output_file_pa
    return final_df
 
 
+def list_input_files(folder_path):
+   """
+   List the input files in a folder, sorted by name.
+
+
+   Arguments:
+   - folder_path: Path to the folder to list.
+
+
+   Returns:
+   - A sorted list of file names, excluding hidden/system files (e.g., .DS_Store) and subfolders.
+   """
+   # os.scandir returns the entry types with the listing, so no extra stat call is needed per file.
+   with os.scandir(folder_path) as entries:
+       return sorted(entry.name for entry in entries if not entry.name.startswith(".") and entry.is_file())
+
+
+def process_file_pair(task):
+   """
+   Create the intermediate and final outputs for one (main, secondary) file pair.
+
+
+   Arguments:
+   - task: A tuple of (main_file_path, secondary_file_path, intermediate_output_file, final_output_file, column_mapping).
+
+
+   Returns:
+   - The path of the final output file (the DataFrames stay in the worker process).
+   """
+   main_file_path, secondary_file_path, intermediate_output_file, final_output_file, column_mapping = task
+
+
+   # Process the main file to create an intermediate output.
+   intermediate_df = create_intermediate_csv(main_file_path, intermediate_output_file)
+
+
+   # Combine the intermediate data with the secondary file to create the final output.
+   create_final_csv(intermediate_df, secondary_file_path, final_output_file, column_mapping)
+   return final_output_file
+
+
 def process_files(main_folder_path, secondary_folder_path, intermediate_output_folder, final_output_folder, column_mapping=None):
    """
    Process files from two input folders in order and handle mismatched file counts.
@@ -158,15 +549,18 @@ def process_files(main_folder_path, secondary_folder_path, intermediate_output_f
       - Extend the smaller folder's file list by repeating its last file as needed.
    4. For each pair of files (main and secondary):
       - Display their names and prompt the user to confirm.
-      - If confirmed, ask for a base name for the output files.
+      - If confirmed, ask for a base name for the output files (asking again if another pair already uses it).
       - Generate paths for the intermediate and final output files using the base name.
-      - Call `create_intermediate_csv` to process the main file and create an intermediate file.
-      - Call `create_final_csv` to combine the intermediate file with the secondary file and create a final file.
+      - If the user declines any pair, abort the process before any file is processed.
+   5. Process the confirmed pairs in parallel (one worker process per pair, up to the number of CPU cores)
+      with `process_file_pair`, which for each pair:
+      - Calls `create_intermediate_csv` to process the main file and create an intermediate file.
+      - Calls `create_final_csv` to combine the intermediate data with the secondary file and create a final file
+        (the intermediate DataFrame is passed directly instead of re-reading the intermediate file).
    """
    # Get sorted lists of files in the main and secondary folders.
-   # Excludes hidden/system files (e.g., .DS_Store)
-   main_files = [f for f in sorted(os.listdir(main_folder_path)) if not f.startswith(".")]
-   secondary_files = [f for f in sorted(os.listdir(secondary_folder_path)) if not f.startswith(".")]
+   main_files = list_input_files(main_folder_path)
+   secondary_files = list_input_files(secondary_folder_path)
 
 
    # Check if the number of files in both folders is the same.
@@ -205,6 +599,11 @@ def process_files(main_folder_path, secondary_folder_path, intermediate_output_f
    secondary_files.extend([secondary_files[-1]] * (max_files - len(secondary_files)))
 
 
+   # Collect every confirmed file pair up front so no prompts are needed while processing.
+   tasks = []
+   used_base_names = set()
+
+
    # Loop through each pair of files from the two folders.
    for i, (main_file, secondary_file) in enumerate(zip(main_files, secondary_files)):
        main_file_path = os.path.join(main_folder_path, main_file)  # Full path for the main file.
@@ -224,36 +623,48 @@ def process_files(main_folder_path, secondary_folder_path, intermediate_output_f
 
 
        # Prompt the user to provide a base name for the output files.
+       # Pairs are processed at the same time, so two pairs must not write to the same output files.
        base_name = input("Enter a base name for output files: ").strip()
+       while base_name in used_base_names:
+           print(f"The base name '{base_name}' is already used by another file pair.")
+           base_name = input("Enter a base name for output files: ").strip()
+       used_base_names.add(base_name)
        intermediate_output_file = os.path.join(intermediate_output_folder, f"{base_name}-intermediate.csv")
        final_output_file = os.path.join(final_output_folder, f"{base_name}-final.csv")
 
 
-       # Process the main file to create an intermediate output.
-       create_intermediate_csv(main_file_path, intermediate_output_file)
+       tasks.append((main_file_path, secondary_file_path, intermediate_output_file, final_output_file, column_mapping))
 
 
-       # Combine the intermediate file with the secondary file to create the final output.
-       create_final_csv(intermediate_output_file, secondary_file_path, final_output_file, column_mapping)
+   # Process the file pairs in parallel; each pair is independent once confirmed.
+   # Workers are started with "spawn" so they never inherit state (threads, open files) from this process.
+   with ProcessPoolExecutor(
+       max_workers=min(len(tasks), os.cpu_count() or 1),
+       mp_context=multiprocessing.get_context("spawn")
+   ) as executor:
+       # Consume the results so an error in any worker is raised here.
+       list(executor.map(process_file_pair, tasks))
           
-# File paths
-main_folder_path = "/input/main"
-secondary_folder_path = "/input/secondary"
-intermediate_output_folder = "/input/intermediate"
-final_output_folder = "/output"
-
-
-# Column mapping for secondary file (optional)
-column_mapping = {
-   'postal address': 'address',
-   'email address': 'email',
-   'model year': 'year',
-   'name': 'first name',
-   'customer name': 'first name'
-}
-
-
-process_files(main_folder_path, secondary_folder_path, intermediate_output_folder, final_output_folder, column_mapping)
+# Only run when executed as a script (worker processes import this module).
+if __name__ == "__main__":
+   # File paths
+   main_folder_path = "/input/main"
+   secondary_folder_path = "/input/secondary"
+   intermediate_output_folder = "/input/intermediate"
+   final_output_folder = "/output"
+
+
+   # Column mapping for secondary file (optional)
+   column_mapping = {
+      'postal address': 'address',
+      'email address': 'email',
+      'model year': 'year',
+      'name': 'first name',
+      'customer name': 'first name'
+   }
+
+
+   process_files(main_folder_path, secondary_folder_path, intermediate_output_folder, final_output_folder, column_mapping)
 
 
 